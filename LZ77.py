@@ -1,5 +1,6 @@
 #!/usr/bin/python3.10
 from collections import namedtuple
+from collections.abc import Iterator
 from bitarray import bitarray
 
 from LZ77Compression.Utils.gusfields_z_alg import z_alg
@@ -9,6 +10,9 @@ from LZ77Compression.huffman_coding import huffman_encode, huffman_decode
 
 EncodingTriple = namedtuple("EncodingTriple", ["offset", "length", "next_unmatched_symbol"])
 
+DEFAULT_SEARCH_WINDOW_SIZE = 1000
+DEFAULT_LOOKAHEAD_BUFFER_SIZE = 300
+
 
 def check_for_match(string: str, sw_start_idx: int, lb_start_idx: int, lb_end_idx: int) -> EncodingTriple | bool:
     if sw_start_idx == lb_start_idx: return False
@@ -34,6 +38,22 @@ def check_for_match(string: str, sw_start_idx: int, lb_start_idx: int, lb_end_id
 
 
 def lz_77_encode(string_to_encode: str, search_window_size: int, lookahead_buffer_size: int) -> list[EncodingTriple]:
+    return list(lz_77_encode_iter(string_to_encode, search_window_size, lookahead_buffer_size))
+
+
+def lz_77_encode_iter(string_to_encode: str, search_window_size: int,
+                      lookahead_buffer_size: int) -> Iterator[EncodingTriple]:
+    """Yields the triples of `lz_77_encode` as they are found, so callers need not hold the whole encoding"""
+    comparison_point_idx = 0
+    while comparison_point_idx < len(string_to_encode):
+        match = lz_77_match_at(string_to_encode, comparison_point_idx, search_window_size, lookahead_buffer_size)
+        yield match
+        comparison_point_idx += match.length + 1
+
+
+def lz_77_match_at(string_to_encode: str, comparison_point_idx: int, search_window_size: int,
+                   lookahead_buffer_size: int) -> EncodingTriple:
+    """The triple encoding `string_to_encode` from `comparison_point_idx`, which depends on no other triple"""
     def window_start_index(comp_idx):
         if comp_idx - search_window_size < 0:
             return 0
@@ -44,22 +64,15 @@ def lz_77_encode(string_to_encode: str, search_window_size: int, lookahead_buffe
             return comp_idx + lookahead_buffer_size
         return len(string_to_encode)
 
-    encoding: list[EncodingTriple] = []
-    comparison_point_idx = 0
-    while comparison_point_idx < len(string_to_encode):
-
-        match = check_for_match(string_to_encode,
-                                window_start_index(comparison_point_idx),
-                                comparison_point_idx,
-                                lookahead_buffer_end_index(comparison_point_idx))
-
-        if not match:
-            match = EncodingTriple(0, 0, string_to_encode[comparison_point_idx])
+    match = check_for_match(string_to_encode,
+                            window_start_index(comparison_point_idx),
+                            comparison_point_idx,
+                            lookahead_buffer_end_index(comparison_point_idx))
 
-        encoding.append(match)
-        comparison_point_idx += match.length + 1
+    if not match:
+        match = EncodingTriple(0, 0, string_to_encode[comparison_point_idx])
 
-    return encoding
+    return match
 
 
 def lz_77_decode(encoding: list[EncodingTriple]) -> str:
@@ -83,18 +96,19 @@ def lz_77_decode_by_triple(decoding: list[str], encoding: EncodingTriple) -> lis
 
 def lz_77_encode_binary(string_to_encode: str, encoding_table: tuple[bitarray, ...],
                         search_window_size: int, lookahead_buffer_size: int) -> bitarray:
-    lz_77_encoding = lz_77_encode(string_to_encode, search_window_size, lookahead_buffer_size)
-
     lz_77_binary_encoding: bitarray = bitarray()
 
-    for e in lz_77_encoding:
-        lz_77_binary_encoding.extend(elias_generalised_encode(e.offset))
-        lz_77_binary_encoding.extend(elias_generalised_encode(e.length))
-        lz_77_binary_encoding.extend(huffman_encode(e.next_unmatched_symbol, encoding_table))
+    for e in lz_77_encode_iter(string_to_encode, search_window_size, lookahead_buffer_size):
+        lz_77_binary_encoding.extend(lz_77_encode_triple_binary(e, encoding_table))
 
     return lz_77_binary_encoding
 
 
+def lz_77_encode_triple_binary(encoding: EncodingTriple, encoding_table: tuple[bitarray, ...]) -> bitarray:
+    return elias_generalised_encode(encoding.offset) + elias_generalised_encode(encoding.length) + \
+           huffman_encode(encoding.next_unmatched_symbol, encoding_table)
+
+
 def lz_77_decode_binary(encoding: bitarray, decode_tree: Vertex, number_of_chars_file_contents: int,
                         start_index: int = 0) -> str:
     decoding: list[str] = []
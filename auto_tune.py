@@ -0,0 +1,218 @@
+#!/usr/bin/python3.10
+from collections import namedtuple
+from time import perf_counter
+
+from bitarray import bitarray
+
+from LZ77Compression.LZ77 import lz_77_encode_binary, DEFAULT_SEARCH_WINDOW_SIZE, DEFAULT_LOOKAHEAD_BUFFER_SIZE
+
+TuningResult = namedtuple("TuningResult", ["search_window_size", "lookahead_buffer_size",
+                                           "chars_per_second", "compression_ratio"])
+
+TARGET_SPEED = "speed"
+TARGET_RATIO = "ratio"
+TARGET_RATIO_UNDER_BUDGET = "budget"
+TARGETS = (TARGET_SPEED, TARGET_RATIO, TARGET_RATIO_UNDER_BUDGET)
+
+# ordered by cost of a match search (search window + lookahead buffer sizes) so cheaper candidates are measured first
+CANDIDATES = tuple(sorted(((sw, lb) for sw in (64, 256, 1000, 4000) for lb in (16, 64, 300)), key=sum))
+
+NUMBER_OF_SAMPLES = 3
+# a candidate is only measured on samples at least this many times its search window + lookahead buffer, so that
+# most of a sample is encoded with the full search window rather than the shorter one available at its start
+SAMPLE_TO_CANDIDATE_RATIO = 2
+MAX_SAMPLE_SIZE = SAMPLE_TO_CANDIDATE_RATIO * sum(CANDIDATES[-1])
+# total characters compressed when tuning, as a fraction of the characters in the input
+MAX_TUNING_WORK_FRACTION = 0.5
+# below this many measurable candidates the input is too small for tuning to pay off, so the defaults are used
+MIN_MEASURABLE_CANDIDATES = 4
+# `TARGET_RATIO_UNDER_BUDGET` stops measuring candidates once tuning has used this fraction of the time budget
+MAX_TUNING_BUDGET_FRACTION = 0.5
+# every target stops measuring candidates once tuning has used this fraction of the estimated time to compress the
+# whole input with the best candidate so far
+MAX_TUNING_TIME_FRACTION = 0.5
+CHAR_BIT_WIDTH = 8
+
+
+def measurable_candidates(txt_len: int) -> tuple[list[tuple[int, int]], int]:
+    """
+    Picks the candidates that can be measured within `MAX_TUNING_WORK_FRACTION` of `txt_len`, each on samples at least
+    `SAMPLE_TO_CANDIDATE_RATIO` times its search window + lookahead buffer.
+    :return: tuple(measurable candidates, sample size)
+    """
+    work = int(txt_len * MAX_TUNING_WORK_FRACTION)
+    number_of_candidates = 0
+    while number_of_candidates < len(CANDIDATES) and SAMPLE_TO_CANDIDATE_RATIO * sum(
+            CANDIDATES[number_of_candidates]) * NUMBER_OF_SAMPLES * (number_of_candidates + 1) <= work:
+        number_of_candidates += 1
+    if number_of_candidates == 0:
+        return [], 0
+    return list(CANDIDATES[:number_of_candidates]), \
+        min(MAX_SAMPLE_SIZE, work // (NUMBER_OF_SAMPLES * number_of_candidates))
+
+
+def sample_input(txt: str, number_of_samples: int, sample_size: int) -> list[str]:
+    """
+    Takes evenly spaced slices of `txt` so that the tuning sees the start, middle and end of the input rather than only
+    its prefix. If `txt` is no longer than all the samples together, `txt` itself is the only sample.
+    """
+    if len(txt) <= number_of_samples * sample_size:
+        return [txt]
+    stride = (len(txt) - sample_size) // (number_of_samples - 1) if number_of_samples > 1 else 0
+    return [txt[i * stride:i * stride + sample_size] for i in range(number_of_samples)]
+
+
+def full_window_cost_fraction(sample_len: int, search_window_size: int, lookahead_buffer_size: int) -> float:
+    """
+    The first `search_window_size` characters of a sample are matched against a shorter search window than the rest
+    of the input will be. Each match costs roughly its search window + lookahead buffer, so this is the mean cost of a
+    match in the sample as a fraction of its cost with the full search window.
+    """
+    mean_search_window = search_window_size - search_window_size ** 2 / (2 * sample_len) \
+        if search_window_size <= sample_len else sample_len / 2
+    return (mean_search_window + lookahead_buffer_size) / (search_window_size + lookahead_buffer_size)
+
+
+def measure_parameters(samples: list[str], encoding_table: tuple[bitarray, ...],
+                       search_window_size: int, lookahead_buffer_size: int) -> TuningResult:
+    """
+    Compresses every sample with `lz_77_encode_binary` under the given parameters.
+    :return: throughput (in characters per second, scaled by `full_window_cost_fraction` to estimate that of the whole
+    input) and compression ratio (encoded bits / original bits) over all samples
+    """
+    total_chars = total_bits = 0
+    total_time = 0.0
+    for sample in samples:
+        start = perf_counter()
+        encoding = lz_77_encode_binary(sample, encoding_table, search_window_size, lookahead_buffer_size)
+        total_time += (perf_counter() - start) / full_window_cost_fraction(len(sample), search_window_size,
+                                                                             lookahead_buffer_size)
+        total_chars += len(sample)
+        total_bits += len(encoding)
+    chars_per_second = total_chars / total_time if total_time > 0 else float("inf")
+    return TuningResult(search_window_size, lookahead_buffer_size,
+                        chars_per_second, total_bits / (total_chars * CHAR_BIT_WIDTH))
+
+
+def select_parameters(results: list[TuningResult], target: str, total_chars: int,
+                      time_budget: float | None = None) -> TuningResult:
+    """
+    :param target: one of `TARGETS`:
+        - `TARGET_SPEED` maximises throughput
+        - `TARGET_RATIO` minimises the compression ratio
+        - `TARGET_RATIO_UNDER_BUDGET` minimises the compression ratio amongst parameters whose estimated time to
+        compress `total_chars` characters is within `time_budget` seconds. Falls back to the fastest parameters if
+        none fit the budget
+    """
+    if target == TARGET_SPEED:
+        return max(results, key=lambda r: r.chars_per_second)
+    if target == TARGET_RATIO:
+        return min(results, key=lambda r: (r.compression_ratio, -r.chars_per_second))
+    if target == TARGET_RATIO_UNDER_BUDGET:
+        if time_budget is None: raise Exception("A time budget is required for target: " + target)
+        within_budget = [r for r in results if total_chars / r.chars_per_second <= time_budget]
+        if not within_budget:
+            return max(results, key=lambda r: r.chars_per_second)
+        return min(within_budget, key=lambda r: (r.compression_ratio, -r.chars_per_second))
+    raise Exception("Unknown tuning target: " + target)
+
+
+def tune_parameters(txt: str, encoding_table: tuple[bitarray, ...], target: str = TARGET_RATIO,
+                    time_budget: float | None = None) -> tuple[int, int]:
+    """
+    Chooses the search window and lookahead buffer sizes for `txt` by compressing a few samples of it with each
+    candidate pair that `measurable_candidates` allows (see `CANDIDATES`).
+    Inputs too small to measure `MIN_MEASURABLE_CANDIDATES` candidates get the default sizes without any tuning, as
+    do inputs too small to measure the default sizes for `TARGET_RATIO`.
+    Candidates are measured cheapest first, and measuring stops once tuning has used `MAX_TUNING_TIME_FRACTION` of the
+    estimated time to compress `txt` with the best candidate so far. `TARGET_SPEED` also stops at the first candidate
+    slower than the fastest so far, and `TARGET_RATIO_UNDER_BUDGET` once tuning has used `MAX_TUNING_BUDGET_FRACTION`
+    of `time_budget`, which has the time spent tuning taken out of it before selecting.
+    `encoding_table` should be the Huffman table of the whole of `txt` so sampled costs match those of the real encode.
+    :return: tuple(search window size, lookahead buffer size)
+    """
+    if target not in TARGETS: raise Exception("Unknown tuning target: " + target)
+    if target == TARGET_RATIO_UNDER_BUDGET and time_budget is None:
+        raise Exception("A time budget is required for target: " + target)
+    candidates, sample_size = measurable_candidates(len(txt))
+    defaults = (DEFAULT_SEARCH_WINDOW_SIZE, DEFAULT_LOOKAHEAD_BUFFER_SIZE)
+    if len(candidates) < MIN_MEASURABLE_CANDIDATES or (target == TARGET_RATIO and defaults not in candidates):
+        # every measurable candidate is cheaper than the defaults, so none is expected to have a better ratio
+        return defaults
+
+    start = perf_counter()
+    samples = sample_input(txt, NUMBER_OF_SAMPLES, sample_size)
+    results: list[TuningResult] = []
+    for sw, lb in candidates:
+        result = measure_parameters(samples, encoding_table, sw, lb)
+        if target == TARGET_SPEED and results and \
+                result.chars_per_second < max(r.chars_per_second for r in results):
+            break  # later candidates cost more still
+        results.append(result)
+        elapsed = perf_counter() - start
+        remaining_budget = None if time_budget is None else time_budget - elapsed
+        best = select_parameters(results, target, len(txt), remaining_budget)
+        if elapsed >= MAX_TUNING_TIME_FRACTION * len(txt) / best.chars_per_second:
+            break
+        if target == TARGET_RATIO_UNDER_BUDGET and elapsed >= MAX_TUNING_BUDGET_FRACTION * time_budget:
+            break
+    if time_budget is not None:
+        time_budget -= perf_counter() - start
+    chosen = select_parameters(results, target, len(txt), time_budget)
+    return chosen.search_window_size, chosen.lookahead_buffer_size
+
+
+if __name__ == "__main__":
+    from LZ77Compression.huffman_coding import create_huffman_table
+    from LZ77Compression.myzip import zip_file_auto, zip_string, encode_file_header, SIZES_RECORDED_MARKER
+    from LZ77Compression.elias_omega_coding import elias_generalised_encode
+    from LZ77Compression.myunzip import unzip_file, decode_file_header
+
+    assert sample_input("abcdefghij", 3, 4) == ["abcdefghij"]
+    assert sample_input("abcdefghijklmnopqrstu", 3, 4) == ["abcd", "ijkl", "qrst"]
+
+    assert measurable_candidates(100) == ([], 0)
+    candidates, sample_size = measurable_candidates(10 ** 6)
+    assert candidates == list(CANDIDATES) and sample_size == MAX_SAMPLE_SIZE
+    candidates, sample_size = measurable_candidates(26000)
+    assert all(SAMPLE_TO_CANDIDATE_RATIO * sum(c) <= sample_size for c in candidates)
+    assert sample_size * NUMBER_OF_SAMPLES * len(candidates) <= 26000 * MAX_TUNING_WORK_FRACTION
+
+    assert full_window_cost_fraction(1000, 100, 0) == 0.95
+    assert full_window_cost_fraction(100, 1000, 0) == 0.05
+
+    fast_poor = TuningResult(64, 16, 1000.0, 0.9)
+    slow_good = TuningResult(1000, 300, 100.0, 0.4)
+    results = [fast_poor, slow_good]
+    assert select_parameters(results, TARGET_SPEED, 1000) == fast_poor
+    assert select_parameters(results, TARGET_RATIO, 1000) == slow_good
+    assert select_parameters(results, TARGET_RATIO_UNDER_BUDGET, 1000, 20.0) == slow_good
+    assert select_parameters(results, TARGET_RATIO_UNDER_BUDGET, 1000, 5.0) == fast_poor
+    assert select_parameters(results, TARGET_RATIO_UNDER_BUDGET, 1000, 0.1) == fast_poor
+
+    string_to_encode = "ratatatatat_a_rat_at_a_rat"
+    assert tune_parameters(string_to_encode, create_huffman_table(string_to_encode), TARGET_SPEED) == \
+           (DEFAULT_SEARCH_WINDOW_SIZE, DEFAULT_LOOKAHEAD_BUFFER_SIZE)
+
+    string_to_encode = "".join(chr(ord("a") + (i * i + i // 7) % 26) for i in range(20000))
+    for t, budget in ((TARGET_SPEED, None), (TARGET_RATIO, None), (TARGET_RATIO_UNDER_BUDGET, 1.0)):
+        zipped = zip_file_auto(string_to_encode, "test.txt", t, budget)
+        file_name, number_of_chars, search_window_size, lookahead_buffer_size, _ = decode_file_header(zipped)
+        assert (file_name, number_of_chars) == ("test.txt", len(string_to_encode))
+        assert (search_window_size, lookahead_buffer_size) in CANDIDATES
+        assert unzip_file(zipped) == ("test.txt", string_to_encode)
+
+    # files zipped before the sizes were recorded still unzip
+    header = encode_file_header(string_to_encode, "test.txt", 100, 20)
+    sizes_len = len(elias_generalised_encode(100) + elias_generalised_encode(20))
+    unrecorded_sizes_zipped = header[len(SIZES_RECORDED_MARKER):-sizes_len] + zip_string(string_to_encode, 100, 20)
+    assert decode_file_header(unrecorded_sizes_zipped)[:4] == ("test.txt", len(string_to_encode), None, None)
+    assert unzip_file(unrecorded_sizes_zipped) == ("test.txt", string_to_encode)
+
+    # large enough for `TARGET_RATIO` to measure the defaults. Repeats are found with the smallest offset in smaller
+    # search windows and so are coded in fewer bits, so tuning picks a smaller search window than the default
+    string_to_encode = "ratatatatat_a_rat_at_a_rat" * 6000
+    search_window_size, lookahead_buffer_size = tune_parameters(string_to_encode, create_huffman_table(string_to_encode),
+                                                                TARGET_RATIO)
+    assert (DEFAULT_SEARCH_WINDOW_SIZE, DEFAULT_LOOKAHEAD_BUFFER_SIZE) in measurable_candidates(len(string_to_encode))[0]
+    assert search_window_size < DEFAULT_SEARCH_WINDOW_SIZE
@@ -8,7 +8,7 @@ from LZ77Compression.Utils.convert_base import convert_base_2_to_10
 from LZ77Compression.Utils.huffman_tree import Vertex
 from LZ77Compression.elias_omega_coding import elias_generalised_decode
 from LZ77Compression.huffman_coding import create_huffman_tree
-from LZ77Compression.myzip import decode_character_metadata, ASCII_FIXED_BINARY_WIDTH
+from LZ77Compression.myzip import decode_character_metadata, ASCII_FIXED_BINARY_WIDTH, SIZES_RECORDED_MARKER
 
 
 def unzip_bits(encoding: bitarray, number_of_chars_file_contents: int, start_index: int = 0) -> str:
@@ -17,10 +17,18 @@ def unzip_bits(encoding: bitarray, number_of_chars_file_contents: int, start_ind
     return lz_77_decode_binary(encoding, huffman_tree_root, number_of_chars_file_contents, index)
 
 
-def unzip_file(encoding: bitarray):
-    """Adheres to zipping convention in `myzip.py`"""
+def decode_file_header(encoding: bitarray) -> tuple[str, int, int | None, int | None, int]:
+    """
+    Decodes the result of `encode_file_header` in `myzip.py`, or the header of files zipped before it recorded the
+    search window and lookahead buffer sizes (those without `SIZES_RECORDED_MARKER`)
+    :return: tuple(file name, number of chars in file contents, search window size, lookahead buffer size,
+    length of `encoding` consumed in decode operation). Both sizes are `None` if they were not recorded
+    """
+    sizes_recorded = encoding[:len(SIZES_RECORDED_MARKER)] == SIZES_RECORDED_MARKER
+    index = len(SIZES_RECORDED_MARKER) if sizes_recorded else 0
     filename_chars_ascii = []
-    chars_for_filename_count, index = elias_generalised_decode(encoding)
+    chars_for_filename_count, read_len = elias_generalised_decode(encoding, index)
+    index += read_len
     count = 0
     while count < chars_for_filename_count:
         filename_chars_ascii.append(chr(convert_base_2_to_10(encoding[index: index + ASCII_FIXED_BINARY_WIDTH])))
@@ -29,6 +37,19 @@ def unzip_file(encoding: bitarray):
     file_name = "".join(filename_chars_ascii)
     number_of_chars_file_contents, read_len = elias_generalised_decode(encoding, index)
     index += read_len
+    if not sizes_recorded:
+        return file_name, number_of_chars_file_contents, None, None, index
+    search_window_size, read_len = elias_generalised_decode(encoding, index)
+    index += read_len
+    lookahead_buffer_size, read_len = elias_generalised_decode(encoding, index)
+    index += read_len
+    return file_name, number_of_chars_file_contents, search_window_size, lookahead_buffer_size, index
+
+
+def unzip_file(encoding: bitarray):
+    """Adheres to zipping convention in `myzip.py`"""
+    # search window and lookahead buffer sizes used when zipping, decoding does not depend on them
+    file_name, number_of_chars_file_contents, _, _, index = decode_file_header(encoding)
     return file_name, unzip_bits(encoding, number_of_chars_file_contents, index)
 
 
@@ -3,12 +3,16 @@ import sys
 
 from bitarray import bitarray
 
-from LZ77Compression.LZ77 import lz_77_encode_binary
+from LZ77Compression.LZ77 import lz_77_encode_binary, DEFAULT_SEARCH_WINDOW_SIZE, DEFAULT_LOOKAHEAD_BUFFER_SIZE
+from LZ77Compression.auto_tune import tune_parameters, TARGET_RATIO
 from LZ77Compression.Utils.convert_base import convert_base_2_to_10, convert_base_10_to_2_fixed_width
 from LZ77Compression.elias_omega_coding import elias_generalised_decode, elias_generalised_encode
 from LZ77Compression.huffman_coding import create_huffman_table
 
 ASCII_FIXED_BINARY_WIDTH = 8
+# Files zipped before the search window and lookahead buffer sizes were recorded start with the Elias coding of a
+# (non-zero) file name length, which always starts with a 0 bit. So a leading 1 bit marks the format that records them
+SIZES_RECORDED_MARKER = bitarray('1')
 
 
 def decode_character_metadata_format(sequence: bitarray, start_index: int) -> tuple[int, str, bitarray]:
@@ -52,7 +56,8 @@ def encode_character_metadata(encodings: tuple[bitarray, ...]) -> bitarray:
     return character_encoding
 
 
-def zip_string(txt: str, search_window_size: int, lookahead_buffer_size: int) -> bitarray:
+def zip_string(txt: str, search_window_size: int, lookahead_buffer_size: int,
+               encodings_by_unicode_value: tuple[bitarray, ...] | None = None) -> bitarray:
     """
     The final string that gets zipped consists of 3 parts, respectively:
         - Elias encoding of the number of distinct characters in the `txt`
@@ -60,41 +65,80 @@ def zip_string(txt: str, search_window_size: int, lookahead_buffer_size: int) ->
         - LZ77 triples encodings:
             `offset` (Elias coding) `length` (Elias coding) and `next_unmatched_symbol` (Huffman coding)
 
+    :param encodings_by_unicode_value: the result of `create_huffman_table(txt)` if the caller already has it
     """
-    encodings_by_unicode_value: tuple[bitarray, ...] = create_huffman_table(txt)
-    number_of_encodings = sum(b is not None for b in encodings_by_unicode_value)
-    number_of_distinct_chars = elias_generalised_encode(number_of_encodings)
-    encoded_character_metadata = encode_character_metadata(encodings_by_unicode_value)
+    if encodings_by_unicode_value is None:
+        encodings_by_unicode_value = create_huffman_table(txt)
+    encoded_huffman_metadata = encode_huffman_metadata(encodings_by_unicode_value)
 
     txt_encoding = lz_77_encode_binary(txt, encodings_by_unicode_value, search_window_size, lookahead_buffer_size)
 
-    return number_of_distinct_chars + encoded_character_metadata + txt_encoding
+    return encoded_huffman_metadata + txt_encoding
+
+
+def encode_huffman_metadata(encodings: tuple[bitarray, ...]) -> bitarray:
+    """The first 2 parts of `zip_string`: the number of distinct characters then their Huffman codes"""
+    number_of_encodings = sum(b is not None for b in encodings)
+    return elias_generalised_encode(number_of_encodings) + encode_character_metadata(encodings)
 
 
-def zip_file(txt: str, file_name: str, search_window_size: int = 1000, lookahead_buffer_size: int = 300):
+def zip_file(txt: str, file_name: str, search_window_size: int = DEFAULT_SEARCH_WINDOW_SIZE,
+             lookahead_buffer_size: int = DEFAULT_LOOKAHEAD_BUFFER_SIZE,
+             encodings_by_unicode_value: tuple[bitarray, ...] | None = None):
     """
     The final string that gets zipped consists of multiple parts, respectively:
+        - `SIZES_RECORDED_MARKER`
         - Length of `file_name` based on binary ASCII representation (Elias coded) then the binary ASCII representation
         of `file_name` itself
         - Number of character in `txt` (Elias coded)
+        - `search_window_size` then `lookahead_buffer_size` (Elias coded). Recorded for reference only, decoding
+        does not depend on them
         - return of `zip_string` which zips `txt`'s contents (see `zip_string` docstring)
 
     """
+    return encode_file_header(txt, file_name, search_window_size, lookahead_buffer_size) + \
+           zip_string(txt, search_window_size, lookahead_buffer_size, encodings_by_unicode_value)
+
+
+def encode_file_header(txt: str, file_name: str, search_window_size: int, lookahead_buffer_size: int) -> bitarray:
+    """All parts of `zip_file` that precede the return of `zip_string`"""
     filename_chars_ascii_encoded = bitarray()
     for c in map(ord, list(file_name)):
         filename_chars_ascii_encoded.extend(convert_base_10_to_2_fixed_width(c, ASCII_FIXED_BINARY_WIDTH))
 
-    return elias_generalised_encode(len(file_name)) + filename_chars_ascii_encoded + \
-           elias_generalised_encode(len(txt)) + zip_string(txt, search_window_size, lookahead_buffer_size)
+    return SIZES_RECORDED_MARKER + elias_generalised_encode(len(file_name)) + filename_chars_ascii_encoded + \
+           elias_generalised_encode(len(txt)) + \
+           elias_generalised_encode(search_window_size) + elias_generalised_encode(lookahead_buffer_size)
+
+
+def zip_file_auto(txt: str, file_name: str, target: str = TARGET_RATIO, time_budget: float | None = None):
+    """
+    As `zip_file` but the search window and lookahead buffer sizes are chosen by `tune_parameters` for `target`
+    (see `auto_tune.py`). The chosen sizes are recorded in the header written by `zip_file`.
+    Inputs too small for tuning to pay off get the default sizes, for `TARGET_RATIO` this is any input too small to
+    measure the defaults within the tuning limits (~140K characters, see `tune_parameters`).
+    """
+    encodings_by_unicode_value: tuple[bitarray, ...] = create_huffman_table(txt)
+    search_window_size, lookahead_buffer_size = tune_parameters(txt, encodings_by_unicode_value, target, time_budget)
+    return zip_file(txt, file_name, search_window_size, lookahead_buffer_size, encodings_by_unicode_value)
 
 
 def main():
-    """CLI input: python myzip.py <inputfilename> <search window> <lookahead_buffer>"""
+    """
+    CLI input: python myzip.py <inputfilename> <search window> <lookahead_buffer>
+           or: python myzip.py <inputfilename> auto [speed | ratio | budget <time budget in seconds>]
+    `auto ratio` keeps the default sizes for inputs below ~140K characters (see `zip_file_auto`)
+    """
     file_name: str = sys.argv[1]
     text: str = open(file_name, "r").read()
-    search_window_size: int = int(sys.argv[2])
-    lookahead_buffer_size: int = int(sys.argv[3])
-    zip_bin = zip_file(text, file_name, search_window_size, lookahead_buffer_size)
+    if sys.argv[2] == "auto":
+        target: str = sys.argv[3] if len(sys.argv) > 3 else TARGET_RATIO
+        time_budget: float | None = float(sys.argv[4]) if len(sys.argv) > 4 else None
+        zip_bin = zip_file_auto(text, file_name, target, time_budget)
+    else:
+        search_window_size: int = int(sys.argv[2])
+        lookahead_buffer_size: int = int(sys.argv[3])
+        zip_bin = zip_file(text, file_name, search_window_size, lookahead_buffer_size)
     with open(file_name + ".bin", "wb") as output_file:
         zip_bin.tofile(output_file)
 
@@ -0,0 +1,138 @@
+#!/usr/bin/python3.10
+import os
+import sys
+from array import array
+from collections.abc import Iterator
+from multiprocessing import Pool
+
+from bitarray import bitarray
+
+from LZ77Compression.LZ77 import EncodingTriple, lz_77_encode_iter, lz_77_match_at, lz_77_encode_triple_binary, \
+    DEFAULT_SEARCH_WINDOW_SIZE, DEFAULT_LOOKAHEAD_BUFFER_SIZE
+from LZ77Compression.huffman_coding import create_huffman_table
+from LZ77Compression.myzip import encode_file_header, encode_huffman_metadata
+
+TOKEN_FIELDS = 3  # `offset`, `length` and the unicode value of `next_unmatched_symbol`
+TOKEN_TYPECODE = "L"  # unsigned integer of at least 32 bits per field
+DEFAULT_SEGMENT_SIZE = 8192
+
+# set in each worker process by `_init_worker` so `txt` is sent to a worker once rather than with every segment
+_worker_args: tuple[str, int, int] | None = None
+
+
+def _init_worker(txt: str, search_window_size: int, lookahead_buffer_size: int) -> None:
+    global _worker_args
+    _worker_args = (txt, search_window_size, lookahead_buffer_size)
+
+
+def parse_segment(segment: tuple[int, int]) -> bytes:
+    """
+    Runs in a worker process: the LZ77 parse of `txt` starting at `segment[0]` and continuing until it reaches
+    `segment[1]`. Matches are searched for in the whole of `txt`, so the search window reaches back before the segment.
+    :return: the triples as an `array` of `TOKEN_TYPECODE` in bytes
+    """
+    txt, search_window_size, lookahead_buffer_size = _worker_args
+    tokens = array(TOKEN_TYPECODE)
+    comparison_point_idx, segment_end = segment
+    while comparison_point_idx < segment_end:
+        match = lz_77_match_at(txt, comparison_point_idx, search_window_size, lookahead_buffer_size)
+        tokens.extend((match.offset, match.length, ord(match.next_unmatched_symbol)))
+        comparison_point_idx += match.length + 1
+    return tokens.tobytes()
+
+
+def lz_77_encode_parallel_iter(txt: str, search_window_size: int, lookahead_buffer_size: int,
+                               processes: int | None = None,
+                               segment_size: int = DEFAULT_SEGMENT_SIZE) -> Iterator[EncodingTriple]:
+    """
+    Yields the same triples as `lz_77_encode_iter` with match finding spread over `processes` worker processes.
+    `txt` is cut into segments of `segment_size` characters and each worker parses a segment from its start (see
+    `parse_segment`). The triple at a position depends only on that position (see `lz_77_match_at`), so once the
+    sequential parse reaches a position the worker parsed from, the rest of the worker's triples are those of the
+    sequential parse. Only the triples between the end of the previous segment's parse and that position are found here.
+    Parses usually meet within a few triples. Repetitive input where they never meet (e.g. a long run of one character
+    with lookahead buffer size dividing the run) falls back to finding that segment's triples here one at a time.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(txt) <= segment_size:
+        yield from lz_77_encode_iter(txt, search_window_size, lookahead_buffer_size)
+        return
+
+    segments = [(start, min(start + segment_size, len(txt))) for start in range(segment_size, len(txt), segment_size)]
+    with Pool(processes, initializer=_init_worker, initargs=(txt, search_window_size, lookahead_buffer_size)) as pool:
+        # the first segment is parsed here while the workers parse the rest
+        parsed_segments = pool.imap(parse_segment, segments)
+        comparison_point_idx = 0
+        while comparison_point_idx < segment_size:
+            match = lz_77_match_at(txt, comparison_point_idx, search_window_size, lookahead_buffer_size)
+            yield match
+            comparison_point_idx += match.length + 1
+
+        for (segment_start, segment_end), payload in zip(segments, parsed_segments):
+            tokens = array(TOKEN_TYPECODE)
+            tokens.frombytes(payload)
+            token_idx, token_position = 0, segment_start
+            while comparison_point_idx < segment_end:
+                while token_position < comparison_point_idx:  # the worker's parse always reaches `segment_end`
+                    token_position += tokens[token_idx + 1] + 1
+                    token_idx += TOKEN_FIELDS
+                if token_position == comparison_point_idx:
+                    break
+                match = lz_77_match_at(txt, comparison_point_idx, search_window_size, lookahead_buffer_size)
+                yield match
+                comparison_point_idx += match.length + 1
+
+            while comparison_point_idx < segment_end:
+                match = EncodingTriple(tokens[token_idx], tokens[token_idx + 1], chr(tokens[token_idx + 2]))
+                yield match
+                comparison_point_idx += match.length + 1
+                token_idx += TOKEN_FIELDS
+
+
+def zip_file_parallel(txt: str, file_name: str, search_window_size: int = DEFAULT_SEARCH_WINDOW_SIZE,
+                      lookahead_buffer_size: int = DEFAULT_LOOKAHEAD_BUFFER_SIZE, processes: int | None = None,
+                      segment_size: int = DEFAULT_SEGMENT_SIZE) -> bitarray:
+    """
+    The same output as `zip_file`, with match finding (nearly all of the time spent zipping) spread over `processes`
+    worker processes by `lz_77_encode_parallel_iter`. The whole stream is still encoded with a single search window,
+    so the compression ratio is unchanged. Defaults to one process per CPU, and to `zip_file`'s sequential match
+    finding on a single CPU.
+    """
+    encodings_by_unicode_value: tuple[bitarray, ...] = create_huffman_table(txt)
+    encoding = encode_file_header(txt, file_name, search_window_size, lookahead_buffer_size) + \
+               encode_huffman_metadata(encodings_by_unicode_value)
+    for e in lz_77_encode_parallel_iter(txt, search_window_size, lookahead_buffer_size, processes, segment_size):
+        encoding.extend(lz_77_encode_triple_binary(e, encodings_by_unicode_value))
+    return encoding
+
+
+def main():
+    """CLI input: python parallel_zip.py <inputfilename> <search window> <lookahead_buffer> [<processes>]"""
+    file_name: str = sys.argv[1]
+    text: str = open(file_name, "r").read()
+    search_window_size: int = int(sys.argv[2])
+    lookahead_buffer_size: int = int(sys.argv[3])
+    processes: int | None = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    zip_bin = zip_file_parallel(text, file_name, search_window_size, lookahead_buffer_size, processes)
+    with open(file_name + ".bin", "wb") as output_file:
+        zip_bin.tofile(output_file)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main()
+    else:
+        from LZ77Compression.myzip import zip_file
+        from LZ77Compression.myunzip import unzip_file
+
+        inputs = ["ratatatatat_a_rat_at_a_rat",  # shorter than a segment
+                  "".join(chr(ord("a") + (i * i + i // 7) % 26) for i in range(3000)),
+                  "b" + "a" * 3000,  # parses from segment starts may never meet
+                  ("ratatatatat_a_rat_at_a_rat" + "".join(chr(ord("a") + i % 23) for i in range(40))) * 60]
+        assert any(len(zip_file(txt, "test.txt", 100, 20)) % 8 for txt in inputs)
+        for txt in inputs:
+            zipped = zip_file(txt, "test.txt", 100, 20)
+            for processes in (1, 2, 3):
+                zipped_parallel = zip_file_parallel(txt, "test.txt", 100, 20, processes, segment_size=97)
+                assert zipped_parallel == zipped and zipped_parallel.tobytes() == zipped.tobytes()
+            assert unzip_file(zipped_parallel) == ("test.txt", txt)